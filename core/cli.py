@@ -37,10 +37,12 @@ def list_sessions():
         return
 
     conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
 
-    cursor.execute("SELECT * FROM sessions WHERE status = 'active' ORDER BY last_active DESC")
+    cursor.execute(
+        "SELECT id, project_path, status, last_active FROM sessions "
+        "WHERE status = 'active' ORDER BY last_active DESC"
+    )
     rows = cursor.fetchall()
     conn.close()
 
@@ -51,8 +53,13 @@ def list_sessions():
     print(f"{'Session ID':<15} {'Project':<40} {'Status':<10} {'Last Active'}")
     print("-" * 100)
 
-    for row in rows:
-        print(f"{row['id']:<15} {row['project_path']:<40} {row['status']:<10} {row['last_active']}")
+    from datetime import datetime
+
+    for session_id, project_path, status, last_active in rows:
+        # Rows written by a pre-migration daemon still hold datetime strings
+        if isinstance(last_active, (int, float)):
+            last_active = datetime.fromtimestamp(last_active / 1000).strftime('%Y-%m-%d %H:%M:%S')
+        print(f"{session_id:<15} {project_path:<40} {status:<10} {last_active}")
 
 
 def end_session(session_id: str):
@@ -65,10 +72,8 @@ def end_session(session_id: str):
         return
 
     conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-
-    cursor.execute("UPDATE sessions SET status = 'ended' WHERE id = ?", (session_id,))
-    conn.commit()
+    with conn:
+        conn.execute("UPDATE sessions SET status = 'ended' WHERE id = ?", (session_id,))
     conn.close()
 
     print(f"Session {session_id} ended")
@@ -114,7 +119,7 @@ def show_logs():
 def cleanup_old():
     """Clean up old sessions."""
     import sqlite3
-    from datetime import datetime, timedelta
+    import time
 
     db_path = INSTALL_DIR / "sessions.db"
     if not db_path.exists():
@@ -122,18 +127,16 @@ def cleanup_old():
         return
 
     conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
 
     # Clean up sessions older than 7 days
-    cutoff = datetime.now() - timedelta(days=7)
-
-    cursor.execute(
-        "DELETE FROM sessions WHERE status != 'active' AND last_active < ?",
-        (cutoff,)
-    )
+    cutoff = int((time.time() - 7 * 24 * 3600) * 1000)
 
+    with conn:
+        cursor = conn.execute(
+            "DELETE FROM sessions WHERE status != 'active' AND last_active < ?",
+            (cutoff,)
+        )
     count = cursor.rowcount
-    conn.commit()
     conn.close()
 
     print(f"Cleaned up {count} old sessions")
@@ -1,14 +1,21 @@
 """Main daemon for Claude-Mattermost integration."""
 
 import os
+import re
+import atexit
 import sys
 import time
-import json
+import queue
 import logging
 import signal
+import threading
+import uuid
+import socketserver
 from pathlib import Path
-from typing import Optional, Dict, Any
-from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor, Future
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional, Dict, Any, NamedTuple
+import orjson
 
 from core.mattermost_client import MattermostClient
 from core.session_manager import SessionManager
@@ -18,29 +25,130 @@ LOG_DIR = Path.home() / ".claude" / "claude-mattermost" / "logs"
 LOG_DIR.mkdir(parents=True, exist_ok=True)
 LOG_FILE = LOG_DIR / "daemon.log"
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_FILE),
-        logging.StreamHandler()
-    ]
-)
+_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_file_handler = logging.FileHandler(LOG_FILE)
+_file_handler.setFormatter(_formatter)
+_stream_handler = logging.StreamHandler()
+_stream_handler.setFormatter(_formatter)
+
+# Log calls only enqueue records; a listener thread does the formatting and I/O
+_log_queue: queue.Queue = queue.Queue(-1)
+_log_listener = QueueListener(_log_queue, _file_handler, _stream_handler, respect_handler_level=True)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+logging.getLogger().setLevel(logging.INFO)
+logging.getLogger().addHandler(QueueHandler(_log_queue))
+
+# The log format uses none of the thread, process or caller fields
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+logging._srcfile = None
 logger = logging.getLogger(__name__)
 
+SOCKET_PATH = Path.home() / ".claude" / "claude-mattermost" / "daemon.sock"
+CLEANUP_BATCH = 10000
+# Response files older than this are past the hook's approval timeout
+RESPONSE_MAX_AGE = 3600
+# Event stream read timeout; longer than the server's ping interval so a
+# healthy idle stream never trips it
+STREAM_READ_TIMEOUT = 120.0
+# Reconnect backoff bounds, and how long a connection must stay up before
+# the backoff resets
+STREAM_MIN_BACKOFF = 1.0
+STREAM_MAX_BACKOFF = 60.0
+STREAM_STABLE_SECS = 60.0
+
+
+class PendingApproval(NamedTuple):
+    """Tool request waiting for a reply in its session thread."""
+
+    session_id: str
+    tool_name: str
+    command: str
+    response_file: str
+
+
+def _write_atomic(path: Path, text: str):
+    """Write a file so readers never see partial contents.
+
+    Args:
+        path: Destination file
+        text: File contents
+    """
+    tmp = f"{path}.tmp"
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        os.write(fd, text.encode())
+    finally:
+        os.close(fd)
+    os.replace(tmp, path)
+
+
+def _remove_response(path: str):
+    """Delete an approval response file and any partial write of it.
+
+    Args:
+        path: Response file path
+    """
+    for stale in (path, f"{path}.tmp"):
+        Path(stale).unlink(missing_ok=True)
+
+
+# Queue markers asking the main loop to poll the channel for missed posts,
+# or to reload the session index after sessions timed out
+_RESYNC = object()
+_RELOAD_SESSIONS = object()
+
+
+class _HookRequestHandler(socketserver.StreamRequestHandler):
+    """Serve one hook request: 4-byte big-endian length + JSON, both ways."""
+
+    def handle(self):
+        try:
+            size = int.from_bytes(self.rfile.read(4), 'big')
+            request = orjson.loads(self.rfile.read(size))
+            response = self.server.daemon.handle_hook_request(request)
+        except Exception as e:
+            logger.error("Hook request failed: %s", e, exc_info=True)
+            response = {'error': str(e)}
+
+        payload = orjson.dumps(response)
+        self.wfile.write(len(payload).to_bytes(4, 'big') + payload)
+
 
 class ClaudeMattermostDaemon:
     """Main daemon that manages Claude-Mattermost integration."""
 
+    # Approval replies; Mattermost may send emoji as unicode or as shortcodes
+    _APPROVE_RE = re.compile(r'\b(?:approved?|yes|ok)\b|✅|:white_check_mark:', re.I)
+    _DENY_RE = re.compile(r'\b(?:deny|denied|no|cancel)\b|❌|:x:', re.I)
+
     def __init__(self):
         """Initialize daemon."""
         self.running = False
         self.client: Optional[MattermostClient] = None
         self.session_manager: Optional[SessionManager] = None
         self.config: Dict[str, Any] = {}
-        self.pending_approvals: Dict[str, Dict[str, Any]] = {}
+        self.pending_approvals: Dict[str, PendingApproval] = {}
+        self._active_sessions: Dict[str, Dict[str, Any]] = {}
+        self.sessions_by_thread: Dict[str, Dict[str, Any]] = {}
+        self._last_seen: Dict[str, int] = {}
+        # Registry data_version the session indexes were loaded at
+        self._db_version: Optional[int] = None
+        self._last_seen_ms = int(time.time() * 1000)
+        self._events: queue.Queue = queue.Queue()
+        self._stream_connected = threading.Event()
+        self._cleanup_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cleanup")
+        self._cleanup_future: Optional[Future] = None
+        self._ack_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ack")
+        self._hook_server: Optional[socketserver.ThreadingUnixStreamServer] = None
+        self._input_dir = Path.home() / ".claude" / "claude-mattermost" / "input"
+        self._response_dir = Path.home() / ".claude" / "claude-mattermost" / "responses"
 
         # Load environment
+        from dotenv import load_dotenv
         load_dotenv()
         self._load_config()
 
@@ -90,72 +198,278 @@ class ClaudeMattermostDaemon:
             return False
 
         if not self.client.set_team(self.config['team_name']):
-            logger.error(f"Failed to set team: {self.config['team_name']}")
+            logger.error("Failed to set team: %s", self.config['team_name'])
             return False
 
         if not self.client.set_channel(self.config['channel_name']):
-            logger.error(f"Failed to set channel: {self.config['channel_name']}")
+            logger.error("Failed to set channel: %s", self.config['channel_name'])
             return False
 
         # Initialize session manager
         db_path = Path.home() / ".claude" / "claude-mattermost" / "sessions.db"
         self.session_manager = SessionManager(str(db_path))
+        self._load_sessions()
+
+        # Create message exchange directories once, not per message
+        self._input_dir.mkdir(parents=True, exist_ok=True)
+        self._response_dir.mkdir(parents=True, exist_ok=True)
 
         # Register signal handlers
         signal.signal(signal.SIGINT, self._handle_shutdown)
         signal.signal(signal.SIGTERM, self._handle_shutdown)
 
+        self._start_hook_server()
+
         self.running = True
         logger.info("Daemon started successfully")
 
         # Main loop
-        self._run_loop()
+        try:
+            self._run_loop()
+        finally:
+            self._stop_hook_server()
+            self._cleanup_executor.shutdown(wait=True)
+            self._ack_executor.shutdown(wait=True)
+            self.session_manager.close()
 
         return True
 
+    def _start_hook_server(self):
+        """Listen for hook requests on the daemon's Unix socket."""
+        if SOCKET_PATH.exists():
+            SOCKET_PATH.unlink()
+
+        self._hook_server = socketserver.ThreadingUnixStreamServer(
+            str(SOCKET_PATH), _HookRequestHandler
+        )
+        self._hook_server.daemon_threads = True
+        self._hook_server.daemon = self
+        os.chmod(SOCKET_PATH, 0o600)
+
+        threading.Thread(
+            target=self._hook_server.serve_forever,
+            name="hook-server",
+            daemon=True
+        ).start()
+        logger.info("Listening for hooks on %s", SOCKET_PATH)
+
+    def _stop_hook_server(self):
+        """Stop the hook server and remove its socket."""
+        if not self._hook_server:
+            return
+
+        self._hook_server.shutdown()
+        self._hook_server.server_close()
+        self._hook_server = None
+        if SOCKET_PATH.exists():
+            SOCKET_PATH.unlink()
+
     def _run_loop(self):
         """Main daemon loop."""
         cleanup_interval = 3600  # 1 hour
         last_cleanup = time.time()
 
+        listener = threading.Thread(
+            target=self._listen_events,
+            name="mattermost-events",
+            daemon=True
+        )
+        listener.start()
+
+        # Fallback poll interval while the event stream is down
+        idle_sleep = 1.0
+        max_sleep = 30.0
+
         while self.running:
             try:
-                # Check for new messages
-                self._process_messages()
+                # Block until a post arrives (wake periodically for cleanup/shutdown)
+                wait = 1.0 if self._stream_connected.is_set() else idle_sleep
+                try:
+                    item = self._events.get(timeout=wait)
+                except queue.Empty:
+                    item = None
+
+                # Reload the session indexes if another process (e.g. the
+                # CLI ending a session) wrote the registry
+                if self.session_manager.data_version() != self._db_version:
+                    self._load_sessions()
+
+                if item is _RESYNC:
+                    self._load_sessions()
+                    self._process_messages()
+                elif item is _RELOAD_SESSIONS:
+                    self._load_sessions()
+                elif item is not None:
+                    self._dispatch_post(item)
+                elif not self._stream_connected.is_set():
+                    # No event stream: poll, backing off while threads stay quiet
+                    had_event = self._process_messages()
+                    idle_sleep = 1.0 if had_event else min(idle_sleep * 1.5, max_sleep)
 
                 # Periodic cleanup
                 if time.time() - last_cleanup > cleanup_interval:
                     self._cleanup_sessions()
                     last_cleanup = time.time()
 
-                # Sleep to avoid tight loop
-                time.sleep(2)
-
             except Exception as e:
-                logger.error(f"Error in main loop: {e}", exc_info=True)
+                logger.error("Error in main loop: %s", e, exc_info=True)
                 time.sleep(5)
 
-    def _process_messages(self):
-        """Process new messages from Mattermost."""
-        # Get active sessions
-        sessions = self.session_manager.get_active_sessions()
-
-        for session in sessions:
-            thread_id = session['thread_id']
+    def _listen_events(self):
+        """Read the Mattermost event stream and queue new posts.
 
-            # Check for new replies
-            latest_reply = self.client.get_latest_reply(thread_id)
-            if not latest_reply:
+        Runs on a worker thread. After every (re)connect the main loop is
+        asked to poll the channel once, to pick up anything posted while
+        the stream was down. Failed connects, and connections that drop
+        soon after opening, are retried with exponential backoff.
+        """
+        backoff = STREAM_MIN_BACKOFF
+        while self.running:
+            try:
+                ws = self.client.open_websocket(timeout=STREAM_READ_TIMEOUT)
+            except Exception as e:
+                logger.error("Event stream connect failed: %s", e)
+                time.sleep(backoff)
+                backoff = min(backoff * 2, STREAM_MAX_BACKOFF)
                 continue
 
-            message = latest_reply['message'].strip()
+            connected_at = time.time()
+            self._stream_connected.set()
+            self._events.put(_RESYNC)
+
+            try:
+                for event in self.client.stream_events(ws):
+                    if not self.running:
+                        break
+                    if event.get('event') != 'posted':
+                        continue
+                    # The post is delivered as a JSON-encoded string
+                    post = orjson.loads(event['data']['post'])
+                    if post.get('root_id') and post.get('channel_id') == self.client.channel_id:
+                        self._events.put(post)
+            except Exception as e:
+                logger.warning("Event stream disconnected: %s", e)
+            finally:
+                self._stream_connected.clear()
+                ws.close()
+
+            if time.time() - connected_at >= STREAM_STABLE_SECS:
+                backoff = STREAM_MIN_BACKOFF
+            time.sleep(backoff)
+            backoff = min(backoff * 2, STREAM_MAX_BACKOFF)
+
+    def _load_sessions(self):
+        """Rebuild the in-memory session indexes from the session registry."""
+        self._db_version = self.session_manager.data_version()
+        active_sessions = {}
+        sessions_by_thread = {}
+        for session in self.session_manager.list_active_sessions():
+            active_sessions[session['id']] = session
+            sessions_by_thread[session['thread_id']] = session
+
+        self._active_sessions = active_sessions
+        self.sessions_by_thread = sessions_by_thread
+
+    def register_session(self, session: Dict[str, Any]):
+        """Start routing posts in a session's thread to it.
+
+        Args:
+            session: Session dict
+        """
+        self._active_sessions[session['id']] = session
+        self.sessions_by_thread[session['thread_id']] = session
+
+    def _get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Look up a session, preferring the in-memory index over SQLite.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            Session dict or None if not found
+        """
+        session = self._active_sessions.get(session_id)
+        if session is None:
+            session = self.session_manager.get_session(session_id)
+        return session
+
+    def _unregister_session(self, session: Dict[str, Any]):
+        """Stop routing posts for a session and drop its per-thread state.
+
+        Args:
+            session: Session dict
+        """
+        thread_id = session['thread_id']
+        self._active_sessions.pop(session['id'], None)
+        self.sessions_by_thread.pop(thread_id, None)
+        self.pending_approvals.pop(thread_id, None)
+        self._last_seen.pop(thread_id, None)
+
+    def _process_messages(self) -> bool:
+        """Poll the channel for posts made since the last poll.
+
+        Returns:
+            True if any new reply was dispatched
+        """
+        posts = self.client.get_new_channel_posts(self._last_seen_ms)
+        if not posts:
+            return False
+
+        self._last_seen_ms = max(
+            self._last_seen_ms,
+            max(p.get('update_at', p['create_at']) for p in posts)
+        )
+
+        had_event = False
+        for post in posts:
+            if post.get('root_id') and self._dispatch_post(post):
+                had_event = True
+
+        return had_event
+
+    def _dispatch_post(self, post: Dict[str, Any]) -> bool:
+        """Route a user post to the session owning its thread.
+
+        Args:
+            post: Mattermost post dict
+
+        Returns:
+            True if the post was new and handled
+        """
+        # Posts from the event stream count as seen too, so a resync after a
+        # reconnect only fetches what arrived while the stream was down
+        self._last_seen_ms = max(self._last_seen_ms, post.get('update_at', post['create_at']))
 
-            # Check if this is an approval response
-            if thread_id in self.pending_approvals:
-                self._handle_approval_response(session, message)
-            else:
-                # Regular message - forward to Claude
-                self._handle_user_message(session, message)
+        if post['user_id'] == self.client.bot_user_id:
+            return False
+
+        thread_id = post.get('root_id')
+        session = self.sessions_by_thread.get(thread_id)
+        if not session:
+            # Thread may belong to a session registered by another process.
+            # This is a read (negative results are cached) since most threads
+            # in the channel have no session; activity is recorded by the
+            # handlers once the post passes the dedupe check
+            session = self.session_manager.get_session_by_thread(thread_id)
+            if not session:
+                return False
+            self.register_session(session)
+
+        # Skip posts already handled (e.g. seen again during a resync)
+        if post['create_at'] <= self._last_seen.get(thread_id, 0):
+            return False
+        self._last_seen[thread_id] = post['create_at']
+
+        message = post['message'].strip()
+
+        # Check if this is an approval response
+        if thread_id in self.pending_approvals:
+            self._handle_approval_response(session, message)
+        else:
+            # Regular message - forward to Claude
+            self._handle_user_message(session, message)
+
+        return True
 
     def _handle_approval_response(self, session: Dict[str, Any], message: str):
         """Handle approval/denial of tool execution.
@@ -171,9 +485,8 @@ class ClaudeMattermostDaemon:
             return
 
         # Parse response
-        message_lower = message.lower()
-        approved = any(word in message_lower for word in ['approve', 'yes', '✅', 'ok'])
-        denied = any(word in message_lower for word in ['deny', 'no', '❌', 'cancel'])
+        approved = bool(self._APPROVE_RE.search(message))
+        denied = bool(self._DENY_RE.search(message))
 
         if not (approved or denied):
             # Not a clear response, prompt again
@@ -183,16 +496,12 @@ class ClaudeMattermostDaemon:
             )
             return
 
-        # Write response to approval file
-        response_file = approval_data['response_file']
-        with open(response_file, 'w') as f:
-            f.write('approved' if approved else 'denied')
+        # Write response to approval file first so Claude unblocks immediately
+        _write_atomic(approval_data.response_file, 'approved' if approved else 'denied')
 
-        # Notify in thread
-        if approved:
-            self.client.post_to_thread(thread_id, "✅ Approved - executing...")
-        else:
-            self.client.post_to_thread(thread_id, "❌ Denied - skipping")
+        # Notify in thread without waiting for the round trip
+        ack_msg = "✅ Approved - executing..." if approved else "❌ Denied - skipping"
+        self._ack_executor.submit(self.client.post_to_thread, thread_id, ack_msg)
 
         # Clear pending approval
         del self.pending_approvals[thread_id]
@@ -208,23 +517,42 @@ class ClaudeMattermostDaemon:
             message: User's message
         """
         # Write message to input file for Claude to read
-        input_file = Path.home() / ".claude" / "claude-mattermost" / "input" / f"{session['id']}.txt"
-        input_file.parent.mkdir(parents=True, exist_ok=True)
-
-        with open(input_file, 'w') as f:
-            f.write(message)
+        _write_atomic(self._input_dir / f"{session['id']}.txt", message)
 
-        logger.info(f"Received message for session {session['id']}: {message[:50]}...")
+        logger.info("Received message for session %s: %.50s...", session['id'], message)
 
         # Update session activity
         self.session_manager.update_activity(session['id'])
 
     def _cleanup_sessions(self):
-        """Clean up old sessions."""
+        """Start a background cleanup pass unless one is still running."""
+        if self._cleanup_future and not self._cleanup_future.done():
+            return
+        self._cleanup_future = self._cleanup_executor.submit(self._drain_cleanup)
+
+    def _drain_cleanup(self):
+        """Time out old sessions in bounded batches (runs on the cleanup thread)."""
         timeout = self.config['session_timeout']
-        count = self.session_manager.cleanup_old_sessions(timeout)
-        if count > 0:
-            logger.info(f"Cleaned up {count} timed-out sessions")
+        total = 0
+
+        while True:
+            count = self.session_manager.cleanup_old_sessions(timeout, limit=CLEANUP_BATCH)
+            total += count
+            if count < CLEANUP_BATCH:
+                break
+
+        if total > 0:
+            logger.info("Cleaned up %s timed-out sessions", total)
+        self._events.put(_RELOAD_SESSIONS)
+
+        # Answers that arrived after the hook stopped waiting are never read
+        cutoff = time.time() - RESPONSE_MAX_AGE
+        for path in self._response_dir.glob("*.txt*"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except OSError:
+                pass
 
     def _handle_shutdown(self, signum, frame):
         """Handle shutdown signal.
@@ -233,9 +561,42 @@ class ClaudeMattermostDaemon:
             signum: Signal number
             frame: Current stack frame
         """
-        logger.info(f"Received signal {signum}, shutting down...")
+        logger.info("Received signal %s, shutting down...", signum)
         self.running = False
 
+    def handle_hook_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Dispatch a request received from a Claude Code hook.
+
+        Args:
+            request: Request dict with an 'action' key
+
+        Returns:
+            Response dict
+        """
+        action = request.get('action')
+        session_id = request.get('session_id', '')
+
+        if action == 'request_approval':
+            response_file = self.handle_tool_request(
+                session_id,
+                request['tool_name'],
+                request['command'],
+                request['description']
+            )
+            return {'response_file': response_file}
+        elif action == 'notification':
+            self.handle_notification(session_id, request['message'])
+        elif action == 'response':
+            self.handle_notification(session_id, request['response'])
+        elif action == 'session_start':
+            return {'thread_id': self.handle_session_start(session_id, request['project_path'])}
+        elif action == 'session_end':
+            self.handle_session_end(session_id)
+        else:
+            return {'error': f"Unknown action: {action}"}
+
+        return {'ok': True}
+
     def handle_tool_request(
         self,
         session_id: str,
@@ -254,9 +615,9 @@ class ClaudeMattermostDaemon:
         Returns:
             Path to response file
         """
-        session = self.session_manager.get_session(session_id)
+        session = self._get_session(session_id)
         if not session:
-            logger.error(f"Session not found: {session_id}")
+            logger.error("Session not found: %s", session_id)
             return ""
 
         thread_id = session['thread_id']
@@ -275,18 +636,23 @@ Reply with:
         # Post to thread
         self.client.post_to_thread(thread_id, message)
 
-        # Create response file
-        response_dir = Path.home() / ".claude" / "claude-mattermost" / "responses"
-        response_dir.mkdir(parents=True, exist_ok=True)
-        response_file = response_dir / f"{session_id}.txt"
+        # A request the hook already gave up on can still be answered late;
+        # drop its file so that answer never reaches anyone
+        previous = self.pending_approvals.get(thread_id)
+        if previous:
+            _remove_response(previous.response_file)
+
+        # One response file per request, so a late answer to an earlier
+        # request cannot be read as the answer to this one
+        response_file = self._response_dir / f"{session_id}-{uuid.uuid4().hex}.txt"
 
         # Track pending approval
-        self.pending_approvals[thread_id] = {
-            'session_id': session_id,
-            'tool_name': tool_name,
-            'command': command,
-            'response_file': str(response_file)
-        }
+        self.pending_approvals[thread_id] = PendingApproval(
+            session_id=session_id,
+            tool_name=tool_name,
+            command=command,
+            response_file=str(response_file)
+        )
 
         # Update activity
         self.session_manager.update_activity(session_id)
@@ -300,9 +666,9 @@ Reply with:
             session_id: Session identifier
             message: Notification message
         """
-        session = self.session_manager.get_session(session_id)
+        session = self._get_session(session_id)
         if not session:
-            logger.error(f"Session not found: {session_id}")
+            logger.error("Session not found: %s", session_id)
             return
 
         thread_id = session['thread_id']
@@ -311,13 +677,45 @@ Reply with:
         # Update activity
         self.session_manager.update_activity(session_id)
 
+    def handle_session_start(self, session_id: str, project_path: str) -> Optional[str]:
+        """Handle session start notification.
+
+        Args:
+            session_id: Session identifier
+            project_path: Absolute path to project directory
+
+        Returns:
+            Thread ID for the session, or None if failed
+        """
+        session = self._get_session(session_id)
+        if session:
+            # A resumed session id picks its ended thread back up
+            if session['status'] != 'active':
+                session = self.session_manager.reactivate_session(session_id)
+                if not session:
+                    return None
+            self.register_session(session)
+            return session['thread_id']
+
+        thread_id = self.client.create_thread(f"🤖 **Session started:** `{project_path}`")
+        if not thread_id:
+            return None
+
+        if not self.session_manager.create_session(
+            session_id, project_path, thread_id, self.client.channel_id
+        ):
+            return None
+
+        self.register_session(self.session_manager.get_session(session_id))
+        return thread_id
+
     def handle_session_end(self, session_id: str):
         """Handle session end notification.
 
         Args:
             session_id: Session identifier
         """
-        session = self.session_manager.get_session(session_id)
+        session = self._get_session(session_id)
         if not session:
             return
 
@@ -326,6 +724,7 @@ Reply with:
 
         # Mark session as ended
         self.session_manager.end_session(session_id)
+        self._unregister_session(session)
 
 
 def main():
@@ -336,7 +735,7 @@ def main():
     except KeyboardInterrupt:
         logger.info("Daemon stopped by user")
     except Exception as e:
-        logger.error(f"Fatal error: {e}", exc_info=True)
+        logger.error("Fatal error: %s", e, exc_info=True)
         sys.exit(1)
 
 
@@ -1,9 +1,53 @@
 """Hook handler scripts for Claude Code integration."""
 
+import os
 import sys
-import argparse
-import requests
-from pathlib import Path
+import json
+import socket
+from typing import Dict, List
+
+DAEMON_SOCKET = os.path.expanduser("~/.claude/claude-mattermost/daemon.sock")
+
+
+def _recvall(sock: socket.socket, size: int) -> bytes:
+    """Read exactly size bytes from a socket.
+
+    Args:
+        sock: Connected socket
+        size: Number of bytes to read
+
+    Returns:
+        Bytes read
+    """
+    data = b''
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("Daemon closed connection")
+        data += chunk
+    return data
+
+
+def _call_daemon(request: dict) -> dict:
+    """Send a request to the daemon over its Unix socket.
+
+    Messages are JSON prefixed with a 4-byte big-endian length.
+
+    Args:
+        request: Request dict (must include 'action')
+
+    Returns:
+        Response dict
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(5)
+        sock.connect(DAEMON_SOCKET)
+
+        payload = json.dumps(request).encode()
+        sock.sendall(len(payload).to_bytes(4, 'big') + payload)
+
+        size = int.from_bytes(_recvall(sock, 4), 'big')
+        return json.loads(_recvall(sock, size))
 
 
 def request_approval(session_id: str, tool_name: str, command: str, description: str) -> str:
@@ -18,28 +62,22 @@ def request_approval(session_id: str, tool_name: str, command: str, description:
     Returns:
         Path to response file
     """
-    daemon_url = "http://localhost:9876"
-
     try:
-        response = requests.post(
-            f"{daemon_url}/request_approval",
-            json={
-                'session_id': session_id,
-                'tool_name': tool_name,
-                'command': command,
-                'description': description
-            },
-            timeout=5
-        )
-
-        if response.status_code == 200:
-            data = response.json()
+        data = _call_daemon({
+            'action': 'request_approval',
+            'session_id': session_id,
+            'tool_name': tool_name,
+            'command': command,
+            'description': description
+        })
+
+        if 'error' not in data:
             return data.get('response_file', '')
         else:
-            print(f"Error: {response.status_code}", file=sys.stderr)
+            print(f"Error: {data['error']}", file=sys.stderr)
             return ''
 
-    except requests.exceptions.ConnectionError:
+    except (FileNotFoundError, ConnectionRefusedError):
         print("Warning: Daemon not running, allowing tool execution", file=sys.stderr)
         return ''
     except Exception as e:
@@ -54,17 +92,12 @@ def send_notification(session_id: str, message: str):
         session_id: Session identifier
         message: Notification message
     """
-    daemon_url = "http://localhost:9876"
-
     try:
-        requests.post(
-            f"{daemon_url}/notification",
-            json={
-                'session_id': session_id,
-                'message': message
-            },
-            timeout=5
-        )
+        _call_daemon({
+            'action': 'notification',
+            'session_id': session_id,
+            'message': message
+        })
     except Exception as e:
         print(f"Error sending notification: {e}", file=sys.stderr)
 
@@ -76,35 +109,64 @@ def send_response(session_id: str, response: str):
         session_id: Session identifier
         response: Response text
     """
-    daemon_url = "http://localhost:9876"
-
     try:
-        requests.post(
-            f"{daemon_url}/response",
-            json={
-                'session_id': session_id,
-                'response': response
-            },
-            timeout=5
-        )
+        _call_daemon({
+            'action': 'response',
+            'session_id': session_id,
+            'response': response
+        })
     except Exception as e:
         print(f"Error sending response: {e}", file=sys.stderr)
 
 
+def _parse_args(names: List[str]) -> Dict[str, str]:
+    """Read hook arguments from the command line without argparse.
+
+    Values are normally passed positionally in the order of names;
+    --session-id style flags are still accepted. argparse is only loaded
+    to print --help.
+
+    Args:
+        names: Argument names in positional order
+
+    Returns:
+        Dict of argument name to value
+    """
+    argv = sys.argv[1:]
+
+    if '-h' in argv or '--help' in argv:
+        import argparse
+        parser = argparse.ArgumentParser()
+        for name in names:
+            parser.add_argument(name)
+        parser.parse_args()
+
+    if argv and argv[0].startswith('--'):
+        values = {}
+        flags = iter(argv)
+        for flag in flags:
+            key, sep, value = flag[2:].partition('=')
+            values[key.replace('-', '_')] = value if sep else next(flags, '')
+    else:
+        values = dict(zip(names, argv))
+
+    missing = [name for name in names if name not in values]
+    if missing:
+        print(f"Error: missing arguments: {', '.join(missing)}", file=sys.stderr)
+        sys.exit(2)
+
+    return values
+
+
 def main_request_approval():
     """CLI entry point for requesting approval."""
-    parser = argparse.ArgumentParser()
-    parser.add_argument('--session-id', required=True)
-    parser.add_argument('--tool-name', required=True)
-    parser.add_argument('--command', required=True)
-    parser.add_argument('--description', required=True)
-    args = parser.parse_args()
+    args = _parse_args(['session_id', 'tool_name', 'command', 'description'])
 
     response_file = request_approval(
-        args.session_id,
-        args.tool_name,
-        args.command,
-        args.description
+        args['session_id'],
+        args['tool_name'],
+        args['command'],
+        args['description']
     )
 
     print(response_file)
@@ -112,22 +174,16 @@ def main_request_approval():
 
 def main_send_notification():
     """CLI entry point for sending notification."""
-    parser = argparse.ArgumentParser()
-    parser.add_argument('--session-id', required=True)
-    parser.add_argument('--message', required=True)
-    args = parser.parse_args()
+    args = _parse_args(['session_id', 'message'])
 
-    send_notification(args.session_id, args.message)
+    send_notification(args['session_id'], args['message'])
 
 
 def main_send_response():
     """CLI entry point for sending response."""
-    parser = argparse.ArgumentParser()
-    parser.add_argument('--session-id', required=True)
-    parser.add_argument('--response', required=True)
-    args = parser.parse_args()
+    args = _parse_args(['session_id', 'response'])
 
-    send_response(args.session_id, args.response)
+    send_response(args['session_id'], args['response'])
 
 
 if __name__ == '__main__':
@@ -2,8 +2,12 @@
 
 import os
 import logging
+import orjson
 import requests
-from typing import Optional, Dict, Any
+import websocket
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Optional, Dict, Any, List, Iterator
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +39,19 @@ class MattermostClient:
             'Content-Type': 'application/json'
         }
 
+        # Shared keep-alive connection pool for all API calls
+        self._session = requests.Session()
+        self._session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+        )
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+
+        self.ws_url = self.base_url.replace('http', 'ws', 1) + "/api/v4/websocket"
+
         self.team_id: Optional[str] = None
         self.channel_id: Optional[str] = None
         self.bot_user_id: Optional[str] = None
@@ -46,17 +63,14 @@ class MattermostClient:
             True if login successful
         """
         try:
-            response = requests.get(
-                f"{self.api_url}/users/me",
-                headers=self.headers
-            )
+            response = self._session.get(f"{self.api_url}/users/me")
             response.raise_for_status()
-            user = response.json()
+            user = orjson.loads(response.content)
             self.bot_user_id = user['id']
-            logger.info(f"Logged in as {user['username']} (ID: {self.bot_user_id})")
+            logger.info("Logged in as %s (ID: %s)", user['username'], self.bot_user_id)
             return True
         except Exception as e:
-            logger.error(f"Login failed: {e}")
+            logger.error("Login failed: %s", e)
             return False
 
     def set_team(self, team_name: str) -> bool:
@@ -69,23 +83,20 @@ class MattermostClient:
             True if team found
         """
         try:
-            response = requests.get(
-                f"{self.api_url}/teams/name/{team_name}",
-                headers=self.headers
-            )
+            response = self._session.get(f"{self.api_url}/teams/name/{team_name}")
             response.raise_for_status()
-            team = response.json()
+            team = orjson.loads(response.content)
             self.team_id = team['id']
-            logger.info(f"Using team: {team_name} (ID: {self.team_id})")
+            logger.info("Using team: %s (ID: %s)", team_name, self.team_id)
             return True
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 404:
-                logger.error(f"Team not found: {team_name}")
+                logger.error("Team not found: %s", team_name)
             else:
-                logger.error(f"Failed to get team: {e}")
+                logger.error("Failed to get team: %s", e)
             return False
         except Exception as e:
-            logger.error(f"Failed to get team: {e}")
+            logger.error("Failed to get team: %s", e)
             return False
 
     def set_channel(self, channel_name: str) -> bool:
@@ -102,25 +113,93 @@ class MattermostClient:
             return False
 
         try:
-            response = requests.get(
-                f"{self.api_url}/teams/{self.team_id}/channels/name/{channel_name}",
-                headers=self.headers
-            )
+            response = self._session.get(f"{self.api_url}/teams/{self.team_id}/channels/name/{channel_name}")
             response.raise_for_status()
-            channel = response.json()
+            channel = orjson.loads(response.content)
             self.channel_id = channel['id']
-            logger.info(f"Using channel: {channel_name} (ID: {self.channel_id})")
+            logger.info("Using channel: %s (ID: %s)", channel_name, self.channel_id)
             return True
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 404:
-                logger.error(f"Channel not found: {channel_name}")
+                logger.error("Channel not found: %s", channel_name)
             else:
-                logger.error(f"Failed to get channel: {e}")
+                logger.error("Failed to get channel: %s", e)
             return False
         except Exception as e:
-            logger.error(f"Failed to get channel: {e}")
+            logger.error("Failed to get channel: %s", e)
             return False
 
+    def open_websocket(self, timeout: Optional[float] = None) -> websocket.WebSocket:
+        """Open an authenticated connection to the Mattermost event stream.
+
+        Waits for the server's reply to the authentication challenge; read
+        events from the returned socket with stream_events().
+
+        Args:
+            timeout: Socket read timeout in seconds (None blocks indefinitely)
+
+        Returns:
+            Connected WebSocket
+
+        Raises:
+            ConnectionError: If the server rejects the token
+        """
+        ws = websocket.create_connection(self.ws_url, timeout=timeout)
+        try:
+            ws.send(orjson.dumps({
+                'seq': 1,
+                'action': 'authentication_challenge',
+                'data': {'token': self.token}
+            }))
+
+            # Events such as 'hello' may arrive before the reply
+            while True:
+                reply = orjson.loads(ws.recv())
+                if reply.get('seq_reply') == 1:
+                    break
+            if reply.get('status') != 'OK':
+                raise ConnectionError(f"Event stream authentication failed: {reply.get('error')}")
+        except Exception:
+            ws.close()
+            raise
+
+        logger.info("Connected to event stream: %s", self.ws_url)
+        return ws
+
+    def stream_events(self, ws: websocket.WebSocket) -> Iterator[Dict[str, Any]]:
+        """Yield events from an open event stream.
+
+        When a read times out a ping is sent; if the next read also times
+        out the connection is treated as dead, since a dropped network
+        (NAT timeout, sleep) never delivers a close frame.
+
+        Args:
+            ws: Socket returned by open_websocket()
+
+        Yields:
+            Decoded event dicts
+
+        Raises:
+            ConnectionError: If the stream is closed or stops responding
+        """
+        awaiting_pong = False
+        while True:
+            try:
+                opcode, data = ws.recv_data(control_frame=True)
+            except websocket.WebSocketTimeoutException:
+                if awaiting_pong:
+                    raise ConnectionError("Event stream stopped responding")
+                awaiting_pong = True
+                ws.ping()
+                continue
+
+            # Any frame, including a pong or server ping, proves the link is up
+            awaiting_pong = False
+            if opcode == websocket.ABNF.OPCODE_CLOSE:
+                raise ConnectionError("Event stream closed by server")
+            if opcode == websocket.ABNF.OPCODE_TEXT:
+                yield orjson.loads(data)
+
     def create_thread(self, message: str) -> Optional[str]:
         """Create a new thread in the configured channel.
 
@@ -135,20 +214,19 @@ class MattermostClient:
             return None
 
         try:
-            response = requests.post(
+            response = self._session.post(
                 f"{self.api_url}/posts",
-                headers=self.headers,
-                json={
+                data=orjson.dumps({
                     'channel_id': self.channel_id,
                     'message': message
-                }
+                })
             )
             response.raise_for_status()
-            post = response.json()
-            logger.info(f"Created thread: {post['id']}")
+            post = orjson.loads(response.content)
+            logger.info("Created thread: %s", post['id'])
             return post['id']
         except Exception as e:
-            logger.error(f"Failed to create thread: {e}")
+            logger.error("Failed to create thread: %s", e)
             return None
 
     def post_to_thread(self, thread_id: str, message: str) -> bool:
@@ -166,19 +244,18 @@ class MattermostClient:
             return False
 
         try:
-            response = requests.post(
+            response = self._session.post(
                 f"{self.api_url}/posts",
-                headers=self.headers,
-                json={
+                data=orjson.dumps({
                     'channel_id': self.channel_id,
                     'message': message,
                     'root_id': thread_id
-                }
+                })
             )
             response.raise_for_status()
             return True
         except Exception as e:
-            logger.error(f"Failed to post to thread: {e}")
+            logger.error("Failed to post to thread: %s", e)
             return False
 
     def get_thread_posts(self, thread_id: str) -> list:
@@ -188,24 +265,16 @@ class MattermostClient:
             thread_id: ID of the thread
 
         Returns:
-            List of posts in the thread
+            List of posts in the thread, oldest first
         """
         try:
-            response = requests.get(
-                f"{self.api_url}/posts/{thread_id}/thread",
-                headers=self.headers
-            )
+            response = self._session.get(f"{self.api_url}/posts/{thread_id}/thread")
             response.raise_for_status()
-            data = response.json()
-            posts = data['posts']
+            data = orjson.loads(response.content)
             # Sort by create_at timestamp
-            sorted_posts = sorted(
-                posts.values(),
-                key=lambda p: p['create_at']
-            )
-            return sorted_posts
+            return sorted(data['posts'].values(), key=lambda p: p['create_at'])
         except Exception as e:
-            logger.error(f"Failed to get thread posts: {e}")
+            logger.error("Failed to get thread posts: %s", e)
             return []
 
     def get_latest_reply(self, thread_id: str) -> Optional[Dict[str, Any]]:
@@ -218,15 +287,39 @@ class MattermostClient:
             Latest post dict, or None if no replies
         """
         posts = self.get_thread_posts(thread_id)
-        if not posts:
+        return next((p for p in reversed(posts) if p['user_id'] != self.bot_user_id), None)
+
+    def get_new_channel_posts(self, since_ms: int) -> Optional[List[Dict[str, Any]]]:
+        """Get posts created or edited in the configured channel since a time.
+
+        One request covers every thread in the channel.
+
+        Args:
+            since_ms: Unix time in milliseconds
+
+        Returns:
+            List of posts oldest first, or None if failed
+        """
+        if not self.channel_id:
+            logger.error("Channel must be set before fetching posts")
             return None
 
-        # Filter out bot's own posts and get latest
-        user_posts = [p for p in posts if p['user_id'] != self.bot_user_id]
-        if not user_posts:
+        try:
+            response = self._session.get(
+                f"{self.api_url}/channels/{self.channel_id}/posts",
+                params={'since': since_ms}
+            )
+            response.raise_for_status()
+            data = orjson.loads(response.content)
+        except Exception as e:
+            logger.error("Failed to get channel posts: %s", e)
             return None
 
-        return user_posts[-1]
+        posts = sorted(
+            (p for p in data['posts'].values() if not p.get('delete_at')),
+            key=lambda p: p['create_at']
+        )
+        return posts
 
     def update_post(self, post_id: str, message: str) -> bool:
         """Update an existing post.
@@ -239,13 +332,12 @@ class MattermostClient:
             True if successful
         """
         try:
-            response = requests.put(
+            response = self._session.put(
                 f"{self.api_url}/posts/{post_id}/patch",
-                headers=self.headers,
-                json={'message': message}
+                data=orjson.dumps({'message': message})
             )
             response.raise_for_status()
             return True
         except Exception as e:
-            logger.error(f"Failed to update post: {e}")
+            logger.error("Failed to update post: %s", e)
             return False
@@ -1,17 +1,131 @@
 """Session registry for managing Claude-Mattermost sessions."""
 
+import json
+import queue
 import sqlite3
 import logging
-from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+import time
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Optional, List, Dict, Any, Iterator
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# Column order of every SELECT; rows are zipped against it into dicts
+_COLUMNS = ("id", "project_path", "thread_id", "channel_id", "created_at", "last_active", "status")
+_SELECT = f"SELECT {', '.join(_COLUMNS)} FROM sessions"
+
 
 class SessionManager:
     """Manages Claude Code sessions and their Mattermost thread mappings."""
 
+    # Statements are passed as the same string objects on every call so the
+    # connection's statement cache can reuse their prepared form
+    _SQL_INSERT = """
+        INSERT INTO sessions (
+            id, project_path, thread_id, channel_id,
+            created_at, last_active, status
+        ) VALUES (?, ?, ?, ?, ?, ?, 'active')
+        ON CONFLICT(id) DO NOTHING
+        RETURNING id
+    """
+    _SQL_GET_BY_ID = f"{_SELECT} WHERE id = ?"
+    _SQL_GET_BY_THREAD = f"{_SELECT} WHERE thread_id = ? AND status = 'active'"
+    _SQL_LIST_ACTIVE = f"{_SELECT} WHERE status = 'active' ORDER BY last_active DESC"
+    _SQL_UPDATE_ACTIVITY = "UPDATE sessions SET last_active = ? WHERE id = ?"
+    _SQL_REACTIVATE = f"""
+        UPDATE sessions
+        SET status = 'active', last_active = ?
+        WHERE id = ?
+        RETURNING {', '.join(_COLUMNS)}
+    """
+    # Batch statements take the ids as one JSON array parameter and return
+    # the affected (id, thread_id) pairs for cache invalidation
+    _SQL_END = """
+        UPDATE sessions
+        SET status = 'ended'
+        WHERE id IN (SELECT value FROM json_each(?))
+        RETURNING id, thread_id
+    """
+    _SQL_CLEANUP = """
+        UPDATE sessions
+        SET status = 'timeout'
+        WHERE id IN (
+            SELECT id FROM sessions
+            WHERE status = 'active'
+            AND last_active < ?
+            LIMIT ?
+        )
+        RETURNING id, thread_id
+    """
+    _SQL_PURGE = """
+        DELETE FROM sessions
+        WHERE id IN (
+            SELECT id FROM sessions
+            WHERE status IN ('ended', 'timeout')
+            AND last_active < ?
+            LIMIT ?
+        )
+        RETURNING id, thread_id
+    """
+    _SQL_DELETE = """
+        DELETE FROM sessions
+        WHERE id IN (SELECT value FROM json_each(?))
+        RETURNING id, thread_id
+    """
+
+    # Setup run once per process in a single executescript call. WAL is
+    # persistent (commits append to the log instead of rewriting the main
+    # file) and must be set outside the transaction. Timestamps are unix
+    # milliseconds; the UPDATE converts rows written as local-time datetime
+    # strings by older versions. The indexes serve thread lookups and the
+    # status-filtered, last_active-ordered scans.
+    _SQL_SCHEMA = """
+        PRAGMA journal_mode=WAL;
+        BEGIN;
+        CREATE TABLE IF NOT EXISTS sessions (
+            id TEXT PRIMARY KEY,
+            project_path TEXT NOT NULL,
+            thread_id TEXT NOT NULL,
+            channel_id TEXT NOT NULL,
+            created_at INTEGER NOT NULL,
+            last_active INTEGER NOT NULL,
+            status TEXT NOT NULL DEFAULT 'active'
+        );
+        UPDATE sessions
+        SET created_at = CASE WHEN typeof(created_at) = 'text'
+                THEN CAST(ROUND((julianday(created_at, 'utc') - 2440587.5) * 86400000) AS INTEGER)
+                ELSE created_at END,
+            last_active = CASE WHEN typeof(last_active) = 'text'
+                THEN CAST(ROUND((julianday(last_active, 'utc') - 2440587.5) * 86400000) AS INTEGER)
+                ELSE last_active END
+        WHERE typeof(created_at) = 'text' OR typeof(last_active) = 'text';
+        DROP INDEX IF EXISTS idx_sessions_thread;
+        CREATE INDEX IF NOT EXISTS idx_sessions_thread_status ON sessions(thread_id, status);
+        CREATE INDEX IF NOT EXISTS idx_sessions_status_lastactive
+            ON sessions(status, last_active DESC);
+        COMMIT;
+    """
+
+    # Oldest SQLite whose features (RETURNING) the statements above use
+    _MIN_SQLITE = (3, 35, 0)
+
+    # Maximum number of rows kept by the lookup caches
+    _CACHE_SIZE = 1024
+
+    # Buffered activity updates are written after this many seconds or
+    # once this many sessions are pending, whichever comes first
+    _FLUSH_INTERVAL = 1.0
+    _FLUSH_SIZE = 64
+
+    # Refresh planner statistics after this many written rows
+    _OPTIMIZE_EVERY = 1024
+
+    # Number of pooled read-only connections
+    _READERS = 4
+
     def __init__(self, db_path: str):
         """Initialize session manager.
 
@@ -19,30 +133,207 @@ class SessionManager:
             db_path: Path to SQLite database file
         """
         self.db_path = db_path
+        self._lock = threading.Lock()
+        # LRU lookup caches: id -> row, and thread_id -> id (rows live in _by_id)
+        self._by_id: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._by_thread: "OrderedDict[str, str]" = OrderedDict()
+        # Threads known to have no active session (negative lookups)
+        self._no_session: "OrderedDict[str, None]" = OrderedDict()
+        # Bumped on every write so a read that raced a write is not cached
+        self._generation = 0
+        # session_id -> last_active (ms) not yet written to the database
+        self._pending_activity: Dict[str, int] = {}
+        self._flush_timer: Optional[threading.Timer] = None
+        self._write_count = 0
         self._init_db()
+        # data_version the cached rows were read at
+        self._cache_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+        # Fixed pool of read-only connections checked out per query; WAL lets
+        # them read while the shared connection writes
+        self._reader_conns = [self._connect(read_only=True) for _ in range(self._READERS)]
+        self._readers: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        for conn in self._reader_conns:
+            self._readers.put(conn)
+
+    def _connect(self, read_only: bool = False) -> sqlite3.Connection:
+        """Open a connection with the per-connection PRAGMAs applied.
+
+        Args:
+            read_only: Open the database in read-only mode
+
+        Returns:
+            SQLite connection
+        """
+        if read_only:
+            uri = Path(self.db_path).resolve().as_uri() + "?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False, cached_statements=256)
+            conn.execute("PRAGMA query_only=ON")
+        else:
+            # Take the write lock when a transaction begins rather than on its
+            # first write, so a concurrent writer fails fast instead of deadlocking
+            conn = sqlite3.connect(
+                self.db_path,
+                check_same_thread=False,
+                cached_statements=256,
+                isolation_level="IMMEDIATE",
+            )
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-64000")
+        # Serve page reads from a memory map instead of pread() calls
+        conn.execute("PRAGMA mmap_size=268435456")
+        return conn
 
     def _init_db(self):
         """Initialize database schema."""
+        # Writes rely on RETURNING (SQLite 3.35+) and batch ids through json_each
+        if sqlite3.sqlite_version_info < self._MIN_SQLITE:
+            raise RuntimeError(
+                f"SQLite {'.'.join(map(str, self._MIN_SQLITE))}+ is required, "
+                f"but Python is linked against {sqlite3.sqlite_version}"
+            )
+
         Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
 
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS sessions (
-                id TEXT PRIMARY KEY,
-                project_path TEXT NOT NULL,
-                thread_id TEXT NOT NULL,
-                channel_id TEXT NOT NULL,
-                created_at TIMESTAMP NOT NULL,
-                last_active TIMESTAMP NOT NULL,
-                status TEXT NOT NULL DEFAULT 'active'
+        # One connection shared by all methods (guarded by self._lock)
+        self._conn = self._connect()
+        try:
+            self._conn.execute("SELECT value FROM json_each('[]')")
+        except sqlite3.OperationalError:
+            self._conn.close()
+            raise RuntimeError(
+                f"SQLite {sqlite3.sqlite_version} was built without the JSON1 extension"
             )
-        """)
+        self._conn.executescript(self._SQL_SCHEMA)
+        logger.info("Database initialized at %s", self.db_path)
+
+    @contextmanager
+    def _reading(self) -> Iterator[sqlite3.Connection]:
+        """Check out a pooled read-only connection, waiting if all are in use.
+
+        Yields:
+            SQLite connection
+        """
+        conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    def _cache_put(self, session: Dict[str, Any]):
+        """Add a session row to the lookup caches (caller holds self._lock).
 
-        conn.commit()
-        conn.close()
-        logger.info(f"Database initialized at {self.db_path}")
+        Args:
+            session: Session dict
+        """
+        self._by_id[session['id']] = session
+        self._by_id.move_to_end(session['id'])
+        if len(self._by_id) > self._CACHE_SIZE:
+            self._by_id.popitem(last=False)
+
+        self._no_session.pop(session['thread_id'], None)
+        self._by_thread[session['thread_id']] = session['id']
+        self._by_thread.move_to_end(session['thread_id'])
+        if len(self._by_thread) > self._CACHE_SIZE:
+            self._by_thread.popitem(last=False)
+
+    def _sync_cache(self) -> int:
+        """Drop cached rows if another connection committed since they were read.
+
+        Other processes (e.g. the CLI) write the database directly, so the
+        caches cannot see their changes otherwise (caller holds self._lock).
+
+        Returns:
+            Current data_version
+        """
+        version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if version != self._cache_version:
+            self._cache_version = version
+            self._generation += 1
+            self._by_id.clear()
+            self._by_thread.clear()
+            self._no_session.clear()
+        return version
+
+    def _cache_drop(self, rows: List[tuple]):
+        """Remove sessions from the lookup caches (caller holds self._lock).
+
+        Args:
+            rows: (id, thread_id) pairs
+        """
+        self._generation += 1
+        for session_id, thread_id in rows:
+            self._by_id.pop(session_id, None)
+            self._by_thread.pop(thread_id, None)
+
+    def _count_writes(self, count: int):
+        """Record written rows and refresh planner statistics when due.
+
+        PRAGMA optimize only reruns ANALYZE on tables whose statistics are
+        stale, so it is cheap when nothing changed (caller holds self._lock).
+
+        Args:
+            count: Number of rows written
+        """
+        self._write_count += count
+        if self._write_count >= self._OPTIMIZE_EVERY:
+            self._write_count = 0
+            try:
+                self._conn.execute("PRAGMA optimize")
+            except sqlite3.Error as e:
+                logger.warning("PRAGMA optimize failed: %s", e)
+
+    def _flush_locked(self):
+        """Write buffered activity updates (caller holds self._lock)."""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        if not self._pending_activity:
+            return
+
+        pending = self._pending_activity
+        self._pending_activity = {}
+        try:
+            with self._conn:
+                self._conn.executemany(
+                    self._SQL_UPDATE_ACTIVITY,
+                    [(last_active, session_id) for session_id, last_active in pending.items()]
+                )
+            self._count_writes(len(pending))
+        except Exception as e:
+            logger.error("Failed to update activity: %s", e)
+            # Keep the updates for the next flush unless newer ones arrived
+            pending.update(self._pending_activity)
+            self._pending_activity = pending
+
+    def flush(self):
+        """Write buffered activity updates to the database."""
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        """Flush pending updates and close the database connections."""
+        with self._lock:
+            self._flush_locked()
+            try:
+                self._conn.execute("PRAGMA optimize")
+            except sqlite3.Error as e:
+                logger.warning("PRAGMA optimize failed: %s", e)
+            for conn in self._reader_conns:
+                conn.close()
+            self._conn.close()
+
+    def data_version(self) -> int:
+        """Get a counter that changes whenever another connection commits.
+
+        Lets callers notice writes made by other processes (e.g. the CLI).
+
+        Returns:
+            SQLite data_version of the shared connection
+        """
+        with self._lock:
+            return self._sync_cache()
 
     def create_session(
         self,
@@ -63,27 +354,25 @@ class SessionManager:
             True if created successfully
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
-            now = datetime.now()
-            cursor.execute("""
-                INSERT INTO sessions (
-                    id, project_path, thread_id, channel_id,
-                    created_at, last_active, status
-                ) VALUES (?, ?, ?, ?, ?, ?, 'active')
-            """, (session_id, project_path, thread_id, channel_id, now, now))
-
-            conn.commit()
-            conn.close()
-
-            logger.info(f"Created session {session_id} for {project_path}")
+            now_ms = int(time.time() * 1000)
+            with self._lock:
+                with self._conn:
+                    row = self._conn.execute(
+                        self._SQL_INSERT,
+                        (session_id, project_path, thread_id, channel_id, now_ms, now_ms)
+                    ).fetchone()
+                self._count_writes(1)
+                self._generation += 1
+                self._no_session.pop(thread_id, None)
+
+            if row is None:
+                logger.error("Session %s already exists", session_id)
+                return False
+
+            logger.info("Created session %s for %s", session_id, project_path)
             return True
-        except sqlite3.IntegrityError:
-            logger.error(f"Session {session_id} already exists")
-            return False
         except Exception as e:
-            logger.error(f"Failed to create session: {e}")
+            logger.error("Failed to create session: %s", e)
             return False
 
     def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
@@ -96,22 +385,27 @@ class SessionManager:
             Session dict or None if not found
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-
-            cursor.execute(
-                "SELECT * FROM sessions WHERE id = ?",
-                (session_id,)
-            )
-            row = cursor.fetchone()
-            conn.close()
-
-            if row:
-                return dict(row)
-            return None
+            with self._lock:
+                self._sync_cache()
+                session = self._by_id.get(session_id)
+                if session is not None:
+                    self._by_id.move_to_end(session_id)
+                    return dict(session)
+                generation = self._generation
+
+            with self._reading() as conn:
+                row = conn.execute(self._SQL_GET_BY_ID, (session_id,)).fetchone()
+            if not row:
+                return None
+
+            session = dict(zip(_COLUMNS, row))
+            with self._lock:
+                session['last_active'] = self._pending_activity.get(session_id, session['last_active'])
+                if generation == self._generation:
+                    self._cache_put(session)
+            return dict(session)
         except Exception as e:
-            logger.error(f"Failed to get session: {e}")
+            logger.error("Failed to get session: %s", e)
             return None
 
     def get_session_by_thread(self, thread_id: str) -> Optional[Dict[str, Any]]:
@@ -124,23 +418,64 @@ class SessionManager:
             Session dict or None if not found
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
+            with self._lock:
+                self._sync_cache()
+                session_id = self._by_thread.get(thread_id)
+                session = self._by_id.get(session_id) if session_id else None
+                if session is not None and session['status'] == 'active':
+                    self._by_thread.move_to_end(thread_id)
+                    self._by_id.move_to_end(session_id)
+                    return dict(session)
+                if thread_id in self._no_session:
+                    self._no_session.move_to_end(thread_id)
+                    return None
+                generation = self._generation
+
+            with self._reading() as conn:
+                row = conn.execute(self._SQL_GET_BY_THREAD, (thread_id,)).fetchone()
+            with self._lock:
+                if not row:
+                    self._by_thread.pop(thread_id, None)
+                    if generation == self._generation:
+                        self._no_session[thread_id] = None
+                        if len(self._no_session) > self._CACHE_SIZE:
+                            self._no_session.popitem(last=False)
+                    return None
+
+                session = dict(zip(_COLUMNS, row))
+                session['last_active'] = self._pending_activity.get(session['id'], session['last_active'])
+                if generation == self._generation:
+                    self._cache_put(session)
+            return dict(session)
+        except Exception as e:
+            logger.error("Failed to get session by thread: %s", e)
+            return None
 
-            cursor.execute(
-                "SELECT * FROM sessions WHERE thread_id = ? AND status = 'active'",
-                (thread_id,)
-            )
-            row = cursor.fetchone()
-            conn.close()
+    def list_active_sessions(self) -> Iterator[Dict[str, Any]]:
+        """Iterate over active sessions, most recently active first.
 
-            if row:
-                return dict(row)
-            return None
+        Rows are streamed from the cursor in batches rather than
+        materialized all at once. Buffered activity updates are flushed
+        first so last_active and the ordering are current. A pooled read
+        connection stays checked out until the iterator is exhausted or
+        closed.
+
+        Yields:
+            Session dicts
+        """
+        try:
+            self.flush()
+            with self._reading() as conn:
+                cursor = conn.execute(self._SQL_LIST_ACTIVE)
+
+                while True:
+                    batch = cursor.fetchmany(256)
+                    if not batch:
+                        break
+                    for row in batch:
+                        yield dict(zip(_COLUMNS, row))
         except Exception as e:
-            logger.error(f"Failed to get session by thread: {e}")
-            return None
+            logger.error("Failed to get active sessions: %s", e)
 
     def get_active_sessions(self) -> List[Dict[str, Any]]:
         """Get all active sessions.
@@ -148,21 +483,7 @@ class SessionManager:
         Returns:
             List of session dicts
         """
-        try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-
-            cursor.execute(
-                "SELECT * FROM sessions WHERE status = 'active' ORDER BY last_active DESC"
-            )
-            rows = cursor.fetchall()
-            conn.close()
-
-            return [dict(row) for row in rows]
-        except Exception as e:
-            logger.error(f"Failed to get active sessions: {e}")
-            return []
+        return list(self.list_active_sessions())
 
     def update_activity(self, session_id: str) -> bool:
         """Update last activity timestamp for a session.
@@ -173,21 +494,41 @@ class SessionManager:
         Returns:
             True if updated successfully
         """
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+        return self.update_activities([session_id])
+
+    def update_activities(self, session_ids: List[str]) -> bool:
+        """Update last activity timestamp for several sessions.
 
-            cursor.execute("""
-                UPDATE sessions
-                SET last_active = ?
-                WHERE id = ?
-            """, (datetime.now(), session_id))
+        Updates are buffered and written together by a single transaction
+        after _FLUSH_INTERVAL seconds, or sooner once _FLUSH_SIZE sessions
+        are pending.
 
-            conn.commit()
-            conn.close()
+        Args:
+            session_ids: Session identifiers
+
+        Returns:
+            True if updated successfully
+        """
+        try:
+            now_ms = int(time.time() * 1000)
+            with self._lock:
+                # Keep cached rows current
+                self._generation += 1
+                for session_id in session_ids:
+                    self._pending_activity[session_id] = now_ms
+                    session = self._by_id.get(session_id)
+                    if session is not None:
+                        session['last_active'] = now_ms
+
+                if len(self._pending_activity) >= self._FLUSH_SIZE:
+                    self._flush_locked()
+                elif self._flush_timer is None:
+                    self._flush_timer = threading.Timer(self._FLUSH_INTERVAL, self.flush)
+                    self._flush_timer.daemon = True
+                    self._flush_timer.start()
             return True
         except Exception as e:
-            logger.error(f"Failed to update activity: {e}")
+            logger.error("Failed to update activity: %s", e)
             return False
 
     def end_session(self, session_id: str) -> bool:
@@ -199,55 +540,100 @@ class SessionManager:
         Returns:
             True if updated successfully
         """
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+        return self.end_sessions([session_id])
 
-            cursor.execute("""
-                UPDATE sessions
-                SET status = 'ended'
-                WHERE id = ?
-            """, (session_id,))
+    def end_sessions(self, session_ids: List[str]) -> bool:
+        """Mark several sessions as ended in one transaction.
 
-            conn.commit()
-            conn.close()
+        Args:
+            session_ids: Session identifiers
 
-            logger.info(f"Ended session {session_id}")
+        Returns:
+            True if updated successfully
+        """
+        try:
+            with self._lock:
+                self._flush_locked()
+                with self._conn:
+                    rows = self._conn.execute(self._SQL_END, (json.dumps(session_ids),)).fetchall()
+                self._cache_drop(rows)
+                self._count_writes(len(rows))
+
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Ended session(s) %s", ', '.join(session_ids))
             return True
         except Exception as e:
-            logger.error(f"Failed to end session: {e}")
+            logger.error("Failed to end session: %s", e)
             return False
 
-    def cleanup_old_sessions(self, timeout_hours: int = 24) -> int:
-        """Clean up sessions that haven't been active recently.
+    def reactivate_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Mark an ended or timed-out session as active again.
 
         Args:
-            timeout_hours: Hours of inactivity before cleanup
+            session_id: Session identifier
 
         Returns:
-            Number of sessions cleaned up
+            Session dict or None if not found
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            now_ms = int(time.time() * 1000)
+            with self._lock:
+                with self._conn:
+                    row = self._conn.execute(self._SQL_REACTIVATE, (now_ms, session_id)).fetchone()
+                if not row:
+                    return None
+                self._count_writes(1)
+
+                self._generation += 1
+                session = dict(zip(_COLUMNS, row))
+                self._pending_activity.pop(session_id, None)
+                self._cache_put(session)
+
+            logger.info("Reactivated session %s", session_id)
+            return dict(session)
+        except Exception as e:
+            logger.error("Failed to reactivate session: %s", e)
+            return None
 
-            cutoff = datetime.now() - timedelta(hours=timeout_hours)
+    def cleanup_old_sessions(
+        self,
+        timeout_hours: int = 24,
+        limit: int = 10000,
+        retention_days: int = 7
+    ) -> int:
+        """Clean up sessions that haven't been active recently.
 
-            cursor.execute("""
-                UPDATE sessions
-                SET status = 'timeout'
-                WHERE status = 'active'
-                AND last_active < ?
-            """, (cutoff,))
+        Times out inactive sessions and, in the same transaction, deletes
+        ended or timed-out sessions older than the retention period so the
+        table and its indexes stay small.
 
-            count = cursor.rowcount
-            conn.commit()
-            conn.close()
+        Args:
+            timeout_hours: Hours of inactivity before cleanup
+            limit: Maximum number of sessions to time out (and to delete) in one call
+            retention_days: Days an ended or timed-out session is kept
 
-            logger.info(f"Cleaned up {count} old sessions")
+        Returns:
+            Number of sessions timed out
+        """
+        try:
+            now = time.time()
+            cutoff = int((now - timeout_hours * 3600) * 1000)
+            purge_cutoff = int((now - retention_days * 86400) * 1000)
+
+            with self._lock:
+                self._flush_locked()
+                with self._conn:
+                    rows = self._conn.execute(self._SQL_CLEANUP, (cutoff, limit)).fetchall()
+                    purged = self._conn.execute(self._SQL_PURGE, (purge_cutoff, limit)).fetchall()
+                self._cache_drop(rows)
+                self._cache_drop(purged)
+                self._count_writes(len(rows) + len(purged))
+                count = len(rows)
+
+            logger.info("Cleaned up %s old sessions, purged %s", count, len(purged))
             return count
         except Exception as e:
-            logger.error(f"Failed to cleanup sessions: {e}")
+            logger.error("Failed to cleanup sessions: %s", e)
             return 0
 
     def delete_session(self, session_id: str) -> bool:
@@ -259,17 +645,28 @@ class SessionManager:
         Returns:
             True if deleted successfully
         """
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+        return self.delete_sessions([session_id])
 
-            cursor.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+    def delete_sessions(self, session_ids: List[str]) -> bool:
+        """Permanently delete several sessions in one transaction.
 
-            conn.commit()
-            conn.close()
+        Args:
+            session_ids: Session identifiers
 
-            logger.info(f"Deleted session {session_id}")
+        Returns:
+            True if deleted successfully
+        """
+        try:
+            with self._lock:
+                self._flush_locked()
+                with self._conn:
+                    rows = self._conn.execute(self._SQL_DELETE, (json.dumps(session_ids),)).fetchall()
+                self._cache_drop(rows)
+                self._count_writes(len(rows))
+
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Deleted session(s) %s", ', '.join(session_ids))
             return True
         except Exception as e:
-            logger.error(f"Failed to delete session: {e}")
+            logger.error("Failed to delete session: %s", e)
             return False
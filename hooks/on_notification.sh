@@ -13,8 +13,8 @@ PYTHON_SCRIPT="$DAEMON_DIR/hooks/send_notification.py"
 # Call Python script to send notification
 if [ -f "$PYTHON_SCRIPT" ]; then
     python3 "$PYTHON_SCRIPT" \
-        --session-id "$SESSION_ID" \
-        --message "$MESSAGE"
+        "$SESSION_ID" \
+        "$MESSAGE"
 fi
 
 exit 0
@@ -12,8 +12,8 @@ PYTHON_SCRIPT="$DAEMON_DIR/hooks/send_response.py"
 # Call Python script to send response
 if [ -f "$PYTHON_SCRIPT" ]; then
     python3 "$PYTHON_SCRIPT" \
-        --session-id "$SESSION_ID" \
-        --response "$RESPONSE"
+        "$SESSION_ID" \
+        "$RESPONSE"
 fi
 
 exit 0
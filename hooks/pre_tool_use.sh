@@ -15,10 +15,10 @@ PYTHON_SCRIPT="$DAEMON_DIR/hooks/request_approval.py"
 # Call Python script to request approval
 if [ -f "$PYTHON_SCRIPT" ]; then
     RESPONSE_FILE=$(python3 "$PYTHON_SCRIPT" \
-        --session-id "$SESSION_ID" \
-        --tool-name "$TOOL_NAME" \
-        --command "$COMMAND" \
-        --description "$DESCRIPTION")
+        "$SESSION_ID" \
+        "$TOOL_NAME" \
+        "$COMMAND" \
+        "$DESCRIPTION")
 
     # Wait for response (with timeout)
     TIMEOUT=300  # 5 minutes